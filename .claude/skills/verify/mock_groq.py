@@ -0,0 +1,137 @@
+"""Minimal Groq-compatible mock server for driving the examples without a real key.
+
+Run:  python .claude/skills/verify/mock_groq.py [port] [delay_seconds]
+Then: GROQ_API_KEY=dummy GROQ_BASE_URL=http://127.0.0.1:<port> python examples/...
+
+Serves POST /openai/v1/chat/completions. Heuristics:
+- sentiment-analyzer system prompts get "positive"/"negative"/"neutral" based on input
+- SIMPLE/COMPLEX classifier prompts get "SIMPLE"
+- structured-output (tool/function call) requests get a canned tool call echoing a JSON object
+- everything else gets a short canned paragraph
+Each request logs method/path and sleeps `delay_seconds` so concurrency is observable.
+"""
+import json
+import re
+import sys
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PORT = int(sys.argv[1]) if len(sys.argv) > 1 else 8991
+DELAY = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+
+
+def completion_text(body):
+    msgs = body.get("messages", [])
+    sys_text = " ".join(m.get("content", "") or "" for m in msgs if m.get("role") == "system").lower()
+    user_text = " ".join(str(m.get("content", "") or "") for m in msgs if m.get("role") == "user").lower()
+    if "sentiment analyzer" in sys_text or "sentiment" in sys_text and "one word" in sys_text:
+        if any(w in user_text for w in ("happy", "excited", "great", "promoted")):
+            return "positive"
+        if any(w in user_text for w in ("down", "sad", "angry", "wrong")):
+            return "negative"
+        return "neutral"
+    if "simple or complex" in sys_text or "simple: " in sys_text:
+        if any(w in user_text for w in ("how ", "compare", "production")):
+            return "COMPLEX"
+        return "SIMPLE"
+    return "This is a canned mock response for testing. " * 3
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        length = int(self.headers.get("content-length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        time.sleep(DELAY)
+        t = time.strftime("%H:%M:%S")
+        print(f"[{t}] POST {self.path} model={body.get('model')} tools={bool(body.get('tools'))}", flush=True)
+
+        message = {"role": "assistant", "content": completion_text(body)}
+        # structured output / forced tool choice: emit a tool call with plausible JSON args.
+        # For plain bind_tools conversations (no forced choice), emit one tool call on the
+        # first turn (no tool-role message yet) so ReAct loops get exercised.
+        tool_choice = body.get("tool_choice")
+        has_tool_result = any(m.get("role") == "tool" for m in body.get("messages", []))
+        if body.get("tools") and tool_choice is None and not has_tool_result:
+            tool_choice = "auto-first-turn"
+        if body.get("tools") and tool_choice and tool_choice not in ("none",):
+            tool = body["tools"][0]["function"]
+            params = tool.get("parameters", {}).get("properties", {})
+            args = {}
+            for name, spec in params.items():
+                if spec.get("enum"):
+                    args[name] = spec["enum"][0]
+                elif spec.get("type") == "integer":
+                    args[name] = 1
+                elif spec.get("type") == "number":
+                    args[name] = 1.0
+                elif spec.get("type") == "boolean":
+                    args[name] = True
+                else:
+                    args[name] = "mock " + name
+            message = {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [{
+                    "id": "call_mock1",
+                    "type": "function",
+                    "function": {"name": tool["name"], "arguments": json.dumps(args)},
+                }],
+            }
+
+        if body.get("stream"):
+            # SSE streaming: emit the message as word-sized delta chunks
+            self.send_response(200)
+            self.send_header("content-type", "text/event-stream")
+            self.end_headers()
+
+            def chunk(delta, finish=None):
+                payload = {
+                    "id": "chatcmpl-mock",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": body.get("model", "mock"),
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+                }
+                self.wfile.write(b"data: " + json.dumps(payload).encode() + b"\n\n")
+                self.wfile.flush()
+
+            chunk({"role": "assistant"})
+            if message.get("tool_calls"):
+                tc = message["tool_calls"][0]
+                chunk({"tool_calls": [{"index": 0, "id": tc["id"], "type": "function",
+                                       "function": {"name": tc["function"]["name"], "arguments": ""}}]})
+                args = tc["function"]["arguments"]
+                for i in range(0, len(args), 12):
+                    chunk({"tool_calls": [{"index": 0, "function": {"arguments": args[i:i+12]}}]})
+                    time.sleep(0.02)
+            else:
+                for word in (message["content"] or "").split(" "):
+                    chunk({"content": word + " "})
+                    time.sleep(0.02)
+            chunk({}, finish="stop")
+            self.wfile.write(b"data: [DONE]\n\n")
+            return
+
+        resp = {
+            "id": "chatcmpl-mock",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{"index": 0, "message": message, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 10, "total_tokens": 20},
+        }
+        data = json.dumps(resp).encode()
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *a):
+        pass
+
+
+if __name__ == "__main__":
+    print(f"mock groq listening on :{PORT} (delay {DELAY}s)", flush=True)
+    ThreadingHTTPServer(("127.0.0.1", PORT), Handler).serve_forever()
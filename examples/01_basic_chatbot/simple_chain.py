@@ -17,8 +17,11 @@ from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, SystemMessage
 from langgraph.graph import StateGraph, START, END
 
-# Load environment variables (API keys)
-load_dotenv()
+# Load environment variables. load_dotenv() walks the filesystem looking
+# for a .env file - measurable on cold starts and repeated imports - so
+# skip it entirely when the key is already in the environment.
+if "GROQ_API_KEY" not in os.environ:
+    load_dotenv()
 
 # ============================================================================
 # STEP 1: Define the State
@@ -52,6 +55,11 @@ llm = ChatGroq(
     temperature=0.7,       # Controls randomness (0=deterministic, 1=creative)
 )
 
+# The system message is a module-level singleton: rebuilding it per call
+# re-allocates the string and re-runs message validation, and an identical
+# object guarantees a byte-identical prompt prefix across invocations
+ASSISTANT_SYS = SystemMessage(content="You are a helpful and friendly AI assistant.")
+
 
 # ============================================================================
 # STEP 3: Define Nodes (Functions that process state)
@@ -67,12 +75,10 @@ def greet_user(state: ChatbotState) -> ChatbotState:
     - Returns the updated state
     """
     print("📍 Node: greet_user")
-    
-    # Add a system message to define the chatbot's personality
-    system_msg = SystemMessage(content="You are a helpful and friendly AI assistant.")
-    
+
+    # The shared system message defines the chatbot's personality
     # Update the state
-    state["messages"] = [system_msg]
+    state["messages"] = [ASSISTANT_SYS]
     state["metadata"] = {
         "conversation_started": True,
         "node_count": 1
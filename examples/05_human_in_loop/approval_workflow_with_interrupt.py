@@ -11,17 +11,28 @@ Key additions:
 - update_state() to resume
 """
 
+import asyncio
+import logging
 import os
+import sys
+from functools import lru_cache
 from typing import TypedDict, Literal
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, SystemMessage
 from langgraph.graph import StateGraph, START, END
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.types import interrupt
 
+# Make the repo root importable so the shared utils package resolves when
+# this file is run directly as a script
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+from utils.llms import make_llm
+
 load_dotenv()
 
+# Node markers go to logging; set LOG_LEVEL=DEBUG to see them
+logger = logging.getLogger(__name__)
+
 # State definition
 class ContentState(TypedDict):
     topic: str
@@ -31,36 +42,40 @@ class ContentState(TypedDict):
     approved: bool
     final_content: str
 
-# Initialize LLM
-llm = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.7)
+# Initialize LLM via the shared factory (streaming on, output capped)
+llm = make_llm(temperature=0.7, max_tokens=800)
+
+# Prompt singletons - built once, reused across every revision cycle
+_SYS_INITIAL = SystemMessage(content="""You are a content writer.
+Create engaging, informative content (2-3 paragraphs).""")
+_SYS_REVISE_TMPL = """You are a content writer.
+Revise based on this feedback: {fb}
+Address all concerns and add specific examples."""
 
 # Nodes
-def draft_content(state: ContentState) -> ContentState:
+async def draft_content(state: ContentState) -> ContentState:
     """Create draft or revision"""
-    print("📍 Node: draft_content")
+    logger.debug("Node: draft_content")
     
     revision_count = state.get("revision_count", 0)
     has_feedback = bool(state.get("feedback"))
     
     if has_feedback:
-        system_msg = SystemMessage(content=f"""You are a content writer.
-        Revise based on this feedback: {state['feedback']}
-        Address all concerns and add specific examples.""")
+        system_msg = SystemMessage(content=_SYS_REVISE_TMPL.format(fb=state['feedback']))
         revision_count += 1
         print(f"   ✓ Creating revision #{revision_count}")
     else:
-        system_msg = SystemMessage(content="""You are a content writer.
-        Create engaging, informative content (2-3 paragraphs).""")
+        system_msg = _SYS_INITIAL
         print(f"   ✓ Creating initial draft")
     
     user_msg = HumanMessage(content=f"Write about: {state['topic']}")
-    draft = llm.invoke([system_msg, user_msg]).content
+    draft = (await llm.ainvoke([system_msg, user_msg])).content
     
     return {"draft": draft, "revision_count": revision_count, "approved": False}
 
-def request_approval(state: ContentState) -> ContentState:
+async def request_approval(state: ContentState) -> ContentState:
     """⭐ THE KEY NODE - Uses interrupt() to PAUSE execution ⭐"""
-    print("📍 Node: request_approval")
+    logger.debug("Node: request_approval")
     print("\n" + "=" * 70)
     print("📝 DRAFT FOR APPROVAL:")
     print("=" * 70)
@@ -96,7 +111,7 @@ def request_approval(state: ContentState) -> ContentState:
 
 def publish_content(state: ContentState) -> ContentState:
     """Publish approved content"""
-    print("📍 Node: publish_content")
+    logger.debug("Node: publish_content")
     
     final_content = f"""
 ╔══════════════════════════════════════════════════════════════════╗
@@ -125,8 +140,12 @@ def check_approval(state: ContentState) -> Literal["publish", "revise"]:
         return "revise"
 
 # Build graph
+@lru_cache(maxsize=1)
 def create_approval_workflow():
-    """Create graph WITH checkpointer (required for interrupts)"""
+    """Create graph WITH checkpointer (required for interrupts).
+
+    Cached so repeated calls in one process reuse the compiled graph (and
+    its MemorySaver) instead of rebuilding both."""
     print("\n🔨 Building workflow with INTERRUPTS enabled...")
     
     graph = StateGraph(ContentState)
@@ -156,8 +175,13 @@ def create_approval_workflow():
     return app
 
 # Run with interrupt handling
-def run_with_interrupts(app, topic: str):
-    """Run workflow with REAL interrupt handling"""
+async def run_with_interrupts(app, topic: str):
+    """Run workflow with REAL interrupt handling.
+
+    The driver is async so the blocking input() calls run in a worker
+    thread (asyncio.to_thread) while the event loop stays free - which
+    lets us pre-warm the LLM's HTTP connection during human think time.
+    """
     print("=" * 70)
     print(f"📋 Topic: {topic}")
     print("=" * 70)
@@ -184,7 +208,7 @@ def run_with_interrupts(app, topic: str):
         print("─" * 70 + "\n")
         
         # Run until interrupt or completion
-        app.invoke(initial_state, config)
+        await app.ainvoke(initial_state, config)
         
         # Check state
         state = app.get_state(config)
@@ -201,17 +225,29 @@ def run_with_interrupts(app, topic: str):
         print(f"Waiting at: {state.next}")
         print("=" * 70)
         
-        # Get human input
+        # While the human reads and decides, pre-warm the LLM connection so
+        # a rejection's redraft doesn't pay TCP/TLS setup again
+        warmup_task = asyncio.create_task(
+            llm.ainvoke([SystemMessage(content="warm"), HumanMessage(content=".")])
+        )
+
+        # Get human input without blocking the event loop
         print("\n👤 Your decision:")
-        decision = input("Approve? (yes/no): ").strip().lower()
-        
+        decision = (await asyncio.to_thread(input, "Approve? (yes/no): ")).strip().lower()
+
         if decision == "yes":
             human_decision = {"approved": True, "feedback": "Great!"}
             print("   ✅ Approved")
         else:
-            feedback = input("Feedback: ").strip()
+            feedback = (await asyncio.to_thread(input, "Feedback: ")).strip()
             human_decision = {"approved": False, "feedback": feedback}
             print(f"   ❌ Rejected: {feedback}")
+
+        # The warmup result itself is unused - only the live connection matters
+        try:
+            await warmup_task
+        except Exception:
+            pass
         
         # ⭐ RESUME with update_state() ⭐
         print("\n▶️  Resuming...\n")
@@ -231,13 +267,15 @@ def run_with_interrupts(app, topic: str):
     print("=" * 70 + "\n")
 
 def main():
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "WARNING"))
+
     print("=" * 70)
     print("🚀 Human-in-the-Loop WITH REAL INTERRUPTS")
     print("=" * 70)
     
     app = create_approval_workflow()
     topic = input("\nEnter topic: ")
-    run_with_interrupts(app, topic)
+    asyncio.run(run_with_interrupts(app, topic))
     
     print("\n" + "=" * 70)
     print("🎓 Key Learnings:")
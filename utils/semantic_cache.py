@@ -0,0 +1,174 @@
+"""
+Semantic response cache for chat models.
+
+Wraps any LangChain chat model with an embedding-based cache: prompts that
+are semantically equivalent to an earlier one (cosine similarity above a
+threshold) return the stored response without an LLM round-trip. The cache
+can persist to disk so warm entries survive process restarts.
+
+Usage:
+    from utils.semantic_cache import SemanticLLM
+
+    llm = SemanticLLM(ChatGroq(...), threshold=0.95, cache_path=".cache.pkl")
+    response = llm.invoke(messages)   # or await llm.ainvoke(messages)
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+
+from langchain_core.messages import AIMessage
+
+from .embedding_cache import get_embedding
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticLLM:
+    """
+    Embedding-keyed response cache in front of a chat model.
+
+    invoke/ainvoke/abatch mirror the underlying model's interface, so a
+    wrapped model drops into existing call sites unchanged.
+    """
+
+    def __init__(self, llm, threshold: float = 0.95, cache_path: str = None):
+        self.llm = llm
+        self.threshold = threshold
+        self.cache_path = cache_path
+        self._vectors = None       # np.ndarray (N, dim), L2-normalized
+        self._responses = []       # list[str], parallel to _vectors
+        self._exact = {}           # blake2b(prompt) -> response str (the L1)
+        if cache_path and os.path.exists(cache_path):
+            self._load()
+
+    # -- cache internals ----------------------------------------------------
+
+    @staticmethod
+    def _canonical(messages) -> str:
+        """Flatten a message list into one string for hashing/embedding."""
+        return "\n".join(f"{m.type}: {m.content}" for m in messages)
+
+    @staticmethod
+    def _exact_key(canonical: str) -> str:
+        # blake2b is ~2x faster than sha256 on the short strings involved
+        return hashlib.blake2b(canonical.encode()).hexdigest()
+
+    def _lookup(self, messages):
+        """
+        Return (cached AIMessage or None, query embedding or None, exact key).
+
+        The exact-match hash is the first line of defense: byte-identical
+        prompts cost one dict lookup and never touch the encoder. Only on
+        an exact miss do we pay for an embedding and the similarity search.
+        """
+        canonical = self._canonical(messages)
+        key = self._exact_key(canonical)
+        if key in self._exact:
+            logger.debug("Exact cache hit")
+            return AIMessage(content=self._exact[key]), None, key
+
+        # Embeddings come from the shared disk-backed cache, so identical
+        # texts are encoded at most once across processes and restarts
+        query = get_embedding(canonical)
+        if query is None:
+            # No encoder installed - semantic layer stays disabled
+            return None, None, key
+
+        if self._vectors is not None and self._responses:
+            similarities = self._vectors @ query
+            best = similarities.argmax()
+            if similarities[best] >= self.threshold:
+                logger.debug("Semantic cache hit (similarity %.3f)", similarities[best])
+                response = AIMessage(content=self._responses[best])
+                # Seed the exact layer so repeats of this phrasing skip
+                # the encoder as well
+                self._exact[key] = response.content
+                return response, query, key
+        return None, query, key
+
+    def _store(self, query, key, response, save: bool = True) -> None:
+        self._exact[key] = response.content
+        if query is not None:
+            import numpy as np
+
+            row = query.reshape(1, -1)
+            self._vectors = row if self._vectors is None else np.vstack([self._vectors, row])
+            self._responses.append(response.content)
+        # Batched callers pass save=False and persist once at the end
+        if save and self.cache_path:
+            self._save()
+
+    def _load(self) -> None:
+        try:
+            with open(self.cache_path, "rb") as f:
+                self._vectors, self._responses, self._exact = pickle.load(f)
+            logger.debug("Loaded %d cached responses from %s",
+                         len(self._responses), self.cache_path)
+        except Exception:
+            # A corrupt or old-format cache file should never break the
+            # model call path
+            self._vectors, self._responses, self._exact = None, [], {}
+
+    def _save(self) -> None:
+        with open(self.cache_path, "wb") as f:
+            pickle.dump((self._vectors, self._responses, self._exact), f)
+
+    # -- model interface ----------------------------------------------------
+
+    def invoke(self, messages, **kwargs):
+        cached, query, key = self._lookup(messages)
+        if cached is not None:
+            return cached
+        response = self.llm.invoke(messages, **kwargs)
+        self._store(query, key, response)
+        return response
+
+    async def ainvoke(self, messages, **kwargs):
+        cached, query, key = self._lookup(messages)
+        if cached is not None:
+            return cached
+        response = await self.llm.ainvoke(messages, **kwargs)
+        self._store(query, key, response)
+        return response
+
+    async def astream(self, messages, **kwargs):
+        """
+        Stream chunks from the model, or yield a cached reply whole.
+
+        On a miss the chunks pass straight through while being accumulated,
+        and the assembled response is stored once the stream ends.
+        """
+        cached, query, key = self._lookup(messages)
+        if cached is not None:
+            yield cached
+            return
+
+        parts = []
+        async for chunk in self.llm.astream(messages, **kwargs):
+            parts.append(chunk.content)
+            yield chunk
+        self._store(query, key, AIMessage(content="".join(parts)))
+
+    async def abatch(self, message_lists, **kwargs):
+        """Answer cached entries locally; batch only the misses."""
+        results = [None] * len(message_lists)
+        misses, queries, keys = [], [], []
+        for i, messages in enumerate(message_lists):
+            cached, query, key = self._lookup(messages)
+            if cached is not None:
+                results[i] = cached
+            else:
+                misses.append(i)
+                queries.append(query)
+                keys.append(key)
+
+        if misses:
+            responses = await self.llm.abatch([message_lists[i] for i in misses], **kwargs)
+            for i, query, key, response in zip(misses, queries, keys, responses):
+                results[i] = response
+                self._store(query, key, response, save=False)
+            if self.cache_path:
+                self._save()  # One write for the whole batch
+        return results
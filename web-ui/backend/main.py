@@ -6,19 +6,25 @@ Provides REST API endpoints for all LangGraph examples.
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
+import json
 import os
 import sys
+from functools import lru_cache
 from dotenv import load_dotenv
+from langchain_core.messages import AIMessageChunk
 import importlib.util
 
 # Load environment variables
 load_dotenv(dotenv_path="../../.env")
 
-# Add parent directory to path to import examples
+# Add parent directory to path to import examples (and the shared utils)
 sys.path.append("../..")
 
+from utils.batching import DynamicBatcher
+
 app = FastAPI(
     title="LangGraph Learning Hub API",
     description="REST API for LangGraph examples",
@@ -60,6 +66,18 @@ class APIResponse(BaseModel):
     error: Optional[str] = None
 
 
+@lru_cache(maxsize=1)
+def get_content_llm():
+    """Shared, batching content-writer model for the example5 endpoint.
+
+    One client per process instead of one per request, wrapped in a
+    DynamicBatcher so concurrent requests ride a single provider batch.
+    """
+    from langchain_groq import ChatGroq
+
+    return DynamicBatcher(ChatGroq(model="llama-3.3-70b-versatile", temperature=0.7))
+
+
 # Helper function to load modules dynamically
 def load_module(module_name: str, file_path: str):
     """Dynamically load a Python module"""
@@ -70,6 +88,70 @@ def load_module(module_name: str, file_path: str):
     return module
 
 
+# Example modules and their compiled graphs, loaded once at startup.
+# Re-importing a module per request re-parses and re-executes it (including
+# any module-level LLM client construction), so the hot path only does a
+# dict lookup here.
+EXAMPLE_MODULES = {
+    "example1": ("simple_chain",
+                 "../../examples/01_basic_chatbot/simple_chain.py",
+                 "create_chatbot_graph"),
+    "example2": ("sentiment_router",
+                 "../../examples/02_conditional_routing/sentiment_router.py",
+                 "create_sentiment_router"),
+    "example3": ("calculator_agent",
+                 "../../examples/03_tool_calling_agent/calculator_agent.py",
+                 "create_agent_graph"),
+    "example4": ("research_team",
+                 "../../examples/04_multi_agent_system/research_team.py",
+                 "create_research_team"),
+    # The research assistant compiles its graph at import; reuse that
+    # singleton instead of calling the factory a second time
+    "final_project": ("ai_research_assistant",
+                      "../../final_project/ai_research_assistant.py",
+                      "app_graph_singleton"),
+}
+
+
+@app.on_event("startup")
+def preload_graphs():
+    """Import every example module and compile its graph once."""
+    app.state.graphs = {}
+    for key, (module_name, file_path, attr_name) in EXAMPLE_MODULES.items():
+        module = load_module(module_name, file_path)
+        target = getattr(module, attr_name)
+        app.state.graphs[key] = target() if callable(target) else target
+
+
+def stream_graph(app_graph, initial_state) -> StreamingResponse:
+    """Stream a graph run's LLM tokens to the client as Server-Sent Events.
+
+    With a blocking invoke the client sees nothing until the whole run
+    finishes, so perceived time-to-first-token equals full generation
+    latency. Streaming sends each token the moment the model produces it;
+    the stream closes with a [DONE] sentinel.
+    """
+    async def event_stream():
+        try:
+            async for message_chunk, metadata in app_graph.astream(
+                initial_state, stream_mode="messages"
+            ):
+                # messages mode also surfaces whole messages written to
+                # state (system prompts, internal status AIMessages); only
+                # AIMessageChunks are genuine LLM token deltas
+                if not isinstance(message_chunk, AIMessageChunk):
+                    continue
+                token = message_chunk.content
+                if token:
+                    event = {"token": token, "node": metadata.get("langgraph_node", "")}
+                    yield f"data: {json.dumps(event)}\n\n"
+            yield "data: [DONE]\n\n"
+        except Exception as e:
+            yield f"data: {json.dumps({'error': str(e)})}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -91,29 +173,27 @@ async def health_check():
 
 
 @app.post("/api/example1", response_model=APIResponse)
-async def example1(request: Example1Request):
+async def example1(request: Example1Request, stream: bool = False):
     """
     Example 1: Basic Chatbot
     Linear graph with nodes, edges, and state management
     """
     try:
-        # Load the module
-        simple_chain = load_module(
-            "simple_chain",
-            "../../examples/01_basic_chatbot/simple_chain.py"
-        )
-        
-        # Create and run the graph
-        app_graph = simple_chain.create_chatbot_graph()
-        
+        app_graph = app.state.graphs["example1"]
+
         initial_state = {
             "user_input": request.user_input,
             "messages": [],
             "response": "",
             "metadata": {}
         }
-        
-        final_state = app_graph.invoke(initial_state)
+
+        if stream:
+            return stream_graph(app_graph, initial_state)
+
+        # ainvoke keeps the event loop free while the graph runs; its sync
+        # nodes execute on the default executor rather than blocking here
+        final_state = await app_graph.ainvoke(initial_state)
         
         return APIResponse(
             success=True,
@@ -130,28 +210,34 @@ async def example1(request: Example1Request):
 
 
 @app.post("/api/example2", response_model=APIResponse)
-async def example2(request: Example2Request):
+async def example2(request: Example2Request, stream: bool = False):
     """
     Example 2: Sentiment Router
     Conditional routing based on sentiment analysis
     """
-    try:
-        sentiment_router = load_module(
-            "sentiment_router",
-            "../../examples/02_conditional_routing/sentiment_router.py"
+    # example2 has no tokens to stream: its respond node goes through the
+    # DynamicBatcher (a detached batch task the streaming callbacks can't
+    # follow) and returns structured output, so stream mode would only ever
+    # emit [DONE]. Reject it rather than stream an empty feed.
+    if stream:
+        raise HTTPException(
+            status_code=400,
+            detail="example2 uses batched structured output and does not support streaming"
         )
-        
-        app_graph = sentiment_router.create_sentiment_router()
-        
+
+    try:
+        app_graph = app.state.graphs["example2"]
+
         initial_state = {
             "user_input": request.user_input,
             "sentiment": "",
             "response": "",
             "confidence": 0.0
         }
-        
-        final_state = app_graph.invoke(initial_state)
-        
+
+        # The sentiment router uses async nodes, so invoke it asynchronously
+        final_state = await app_graph.ainvoke(initial_state)
+
         return APIResponse(
             success=True,
             data={
@@ -168,7 +254,7 @@ async def example2(request: Example2Request):
 
 
 @app.post("/api/example3", response_model=APIResponse)
-async def example3(request: Example3Request):
+async def example3(request: Example3Request, stream: bool = False):
     """
     Example 3: Tool-Calling Agent
     Agent with tools using ReAct pattern
@@ -176,37 +262,31 @@ async def example3(request: Example3Request):
     try:
         from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
         
-        calculator_agent = load_module(
-            "calculator_agent",
-            "../../examples/03_tool_calling_agent/calculator_agent.py"
-        )
-        
-        app_graph = calculator_agent.create_agent_graph()
-        
+        app_graph = app.state.graphs["example3"]
+
         initial_state = {
             "messages": [
                 SystemMessage(content="You are a helpful assistant with access to tools."),
                 HumanMessage(content=request.user_input)
             ]
         }
-        
-        final_state = app_graph.invoke(initial_state)
-        
-        # Extract final response and tool usage
-        final_response = None
-        tool_calls = 0
-        
-        for message in reversed(final_state["messages"]):
-            if isinstance(message, AIMessage):
-                if message.tool_calls:
-                    tool_calls += 1
-                elif not final_response:
-                    final_response = message.content
-        
+
+        if stream:
+            return stream_graph(app_graph, initial_state)
+
+        # The agent node is async, so invoke the graph asynchronously
+        final_state = await app_graph.ainvoke(initial_state)
+
+        # The agent records its final answer in state; only count tool calls
+        tool_calls = sum(
+            1 for message in final_state["messages"]
+            if isinstance(message, AIMessage) and message.tool_calls
+        )
+
         return APIResponse(
             success=True,
             data={
-                "response": final_response,
+                "response": final_state["final_response"],
                 "tool_calls": tool_calls
             }
         )
@@ -218,36 +298,27 @@ async def example3(request: Example3Request):
 
 
 @app.post("/api/example4", response_model=APIResponse)
-async def example4(request: Example4Request):
+async def example4(request: Example4Request, stream: bool = False):
     """
     Example 4: Multi-Agent System
     Research team with supervisor and specialized agents
     """
     try:
-        research_team = load_module(
-            "research_team",
-            "../../examples/04_multi_agent_system/research_team.py"
-        )
-        
-        app_graph = research_team.create_research_team()
-        
-        initial_state = {
-            "task": request.topic,
-            "messages": [],
-            "research_findings": "",
-            "analysis": "",
-            "final_report": "",
-            "next_agent": "supervisor",
-            "iteration": 0
-        }
-        
-        final_state = app_graph.invoke(initial_state)
-        
+        app_graph = app.state.graphs["example4"]
+
+        # Remaining state fields start from their dataclass defaults
+        initial_state = {"task": request.topic}
+
+        if stream:
+            return stream_graph(app_graph, initial_state)
+
+        # The researcher branches are async nodes, so invoke asynchronously
+        final_state = await app_graph.ainvoke(initial_state)
+
         return APIResponse(
             success=True,
             data={
                 "final_report": final_state["final_report"],
-                "iterations": final_state["iteration"],
                 "research_length": len(final_state["research_findings"]),
                 "analysis_length": len(final_state["analysis"])
             }
@@ -260,17 +331,16 @@ async def example4(request: Example4Request):
 
 
 @app.post("/api/example5", response_model=APIResponse)
-async def example5(request: Example5Request):
+async def example5(request: Example5Request, stream: bool = False):
     """
     Example 5: Human-in-the-Loop
     Content generation with approval workflow
     """
     try:
-        from langchain_groq import ChatGroq
         from langchain_core.messages import SystemMessage, HumanMessage
-        
-        llm = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.7)
-        
+
+        llm = get_content_llm()
+
         if request.feedback:
             # Generate revision based on feedback
             system_msg = SystemMessage(
@@ -283,7 +353,23 @@ async def example5(request: Example5Request):
             )
         
         user_msg = HumanMessage(content=f"Write content about: {request.topic}")
-        response = llm.invoke([system_msg, user_msg])
+
+        if stream:
+            # Stream straight from the underlying model: tokens reach the
+            # client as produced instead of waiting out the whole draft
+            async def event_stream():
+                try:
+                    async for chunk in llm.runnable.astream([system_msg, user_msg]):
+                        if chunk.content:
+                            yield f"data: {json.dumps({'token': chunk.content})}\n\n"
+                    yield "data: [DONE]\n\n"
+                except Exception as e:
+                    yield f"data: {json.dumps({'error': str(e)})}\n\n"
+
+            return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+        # Concurrent example5 requests coalesce into one batched LLM call
+        response = await llm.ainvoke([system_msg, user_msg])
         
         return APIResponse(
             success=True,
@@ -300,19 +386,14 @@ async def example5(request: Example5Request):
 
 
 @app.post("/api/final-project", response_model=APIResponse)
-async def final_project(request: FinalProjectRequest):
+async def final_project(request: FinalProjectRequest, stream: bool = False):
     """
     Final Project: AI Research Assistant
     Complete application combining all concepts
     """
     try:
-        ai_research = load_module(
-            "ai_research_assistant",
-            "../../final_project/ai_research_assistant.py"
-        )
-        
-        app_graph = ai_research.create_research_assistant()
-        
+        app_graph = app.state.graphs["final_project"]
+
         initial_state = {
             "question": request.question,
             "complexity": "",
@@ -325,9 +406,13 @@ async def final_project(request: FinalProjectRequest):
             "messages": [],
             "iteration": 0
         }
-        
-        final_state = app_graph.invoke(initial_state)
-        
+
+        if stream:
+            return stream_graph(app_graph, initial_state)
+
+        # The research assistant's nodes are async, so invoke asynchronously
+        final_state = await app_graph.ainvoke(initial_state)
+
         return APIResponse(
             success=True,
             data={
@@ -39,12 +39,12 @@ const Example2 = () => {
         <div className="max-w-4xl mx-auto">
             <div className="card p-6 mb-6">
                 <h2 className="text-3xl font-bold gradient-text mb-2">🎭 Example 2: Sentiment Router</h2>
-                <p className="text-gray-600"><strong>Concepts:</strong> Conditional Routing, Dynamic Flow</p>
+                <p className="text-gray-600"><strong>Concepts:</strong> Structured Output, Single-Call Classification</p>
             </div>
 
             <div className="card p-6 mb-6 bg-blue-50 border border-blue-200">
                 <p className="text-blue-800">
-                    This example routes your message to different response nodes based on sentiment:
+                    This example detects your message's sentiment and generates a reply in the matching tone — in one structured LLM call:
                 </p>
                 <ul className="list-disc list-inside mt-2 text-blue-700">
                     <li>😊 <strong>Positive</strong> → Enthusiastic response</li>
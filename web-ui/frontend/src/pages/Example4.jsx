@@ -74,7 +74,6 @@ const Example4 = () => {
                         <details className="mt-4 card p-4">
                             <summary className="cursor-pointer font-semibold">📊 Team Statistics</summary>
                             <div className="mt-2 space-y-1 text-sm">
-                                <p><strong>Iterations:</strong> {result.iterations}</p>
                                 <p><strong>Research Length:</strong> {result.research_length} characters</p>
                                 <p><strong>Analysis Length:</strong> {result.analysis_length} characters</p>
                             </div>